@@ -6,9 +6,47 @@ from typing import Dict, List, Optional, Union
 
 # External Dependencies:
 from matplotlib import pyplot as plt
+import numpy as np
 import pandas as pd
 
 
+def _concat_categoricals(cols: List[pd.Series], sep: str = "") -> pd.Categorical:
+    """Concatenate categorical Series element-wise, working on categories rather than values
+
+    Row values are first mapped to combined integer codes, and string labels are then built only
+    once per distinct combination present. Rows where any input is null stay null.
+    """
+    is_null = np.zeros(len(cols[0]), dtype=bool)
+    for col in cols:
+        is_null |= col.cat.codes.to_numpy() < 0
+
+    # Combine codes column by column, re-densifying after each step so the combined codes stay
+    # bounded by the number of distinct combinations present (no overflow on many categories):
+    combined_codes = np.zeros(np.count_nonzero(~is_null), dtype=np.int64)
+    steps = []
+    for col in cols:
+        n_cats = len(col.cat.categories)
+        col_codes = col.cat.codes.to_numpy()[~is_null].astype(np.int64)
+        combined_codes, step_uniques = pd.factorize(combined_codes * n_cats + col_codes)
+        steps.append((step_uniques, n_cats))
+
+    # Decode each distinct combination back to its per-column category labels:
+    combo_ixs = np.arange(len(steps[-1][0]))
+    col_labels = []
+    for col, (step_uniques, n_cats) in zip(reversed(cols), reversed(steps)):
+        combo_ixs, cat_ixs = np.divmod(step_uniques[combo_ixs], n_cats)
+        col_labels.insert(0, col.cat.categories.astype(str).to_numpy(dtype=object)[cat_ixs])
+    labels = col_labels[0]
+    for col_label in col_labels[1:]:
+        labels = (labels + sep + col_label) if sep else (labels + col_label)
+
+    # Different label combinations may concatenate to the same string, so de-duplicate:
+    label_codes, labels = pd.factorize(labels)
+    codes = np.full(len(is_null), -1, dtype=np.int64)
+    codes[~is_null] = label_codes[combined_codes]
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+
 def agg_df_features(
     df: pd.DataFrame,
     config: Dict[str, Dict[str, Union[str, List[str]]]],
@@ -23,24 +61,41 @@ def agg_df_features(
     config :
         A dictionary of configurations keyed by target (aggregated) field name. Each aggregation
         config is itself a dict containing: `features` (the list of input column names) and
-        optionally `sep` (the string separator to be used when concatenating fields).
+        optionally `sep` (the string separator to be used when concatenating fields). If all input
+        features of an aggregation are `category` dtype, the output will be too - which is much
+        faster to compute for large, low-cardinality datasets.
     drop_aggregated :
         Set `False` to keep the affected original features in the DataFrame. By default (`True`),
         these will be dropped so only the aggregated features (and any columns not affected by
         aggregation) will remain.
     """
-    aggregated_features = set()
+    aggregated_features = []
     for aggname, cfg in config.items():
         df_col_names = cfg["features"]
-        if len(df_col_names) > 1:
-            lead_col = df[df_col_names[0]]
-            aggd_col = lead_col.str.cat(df[df_col_names[1:]], sep=cfg.get("sep"))
-            df.loc[:, aggname] = aggd_col
-        else:
-            df.loc[:, aggname] = df[df_col_names[0]]
-        aggregated_features.update(df_col_names)
-
-    if drop_aggregated:
+        is_categorical = [isinstance(df[c].dtype, pd.CategoricalDtype) for c in df_col_names]
+        if len(df_col_names) > 1 and all(is_categorical):
+            # Concatenate the (few) category labels instead of the (many) row values:
+            df[aggname] = _concat_categoricals(
+                [df[col_name] for col_name in df_col_names], sep=cfg.get("sep") or ""
+            )
+        elif len(df_col_names) > 1:
+            # Plain `+` concatenation is significantly faster than the `.str.cat()` accessor:
+            sep = cfg.get("sep") or ""
+            cols = (
+                df[col_name].astype(object) if is_cat else df[col_name]
+                for col_name, is_cat in zip(df_col_names, is_categorical)
+            )
+            aggd_col = next(cols)
+            for col in cols:
+                aggd_col = (aggd_col + sep + col) if sep else (aggd_col + col)
+            df[aggname] = aggd_col
+        elif aggname != df_col_names[0]:
+            df[aggname] = df[df_col_names[0]].values  # (No need for index alignment)
+        aggregated_features.extend(df_col_names)
+
+    # Don't drop any aggregation outputs that re-used an input feature's name:
+    aggregated_features = [f for f in dict.fromkeys(aggregated_features) if f not in config]
+    if drop_aggregated and aggregated_features:
         df.drop(columns=aggregated_features, inplace=True)
     return  # Return None to clarify that modification is in-place.
 
@@ -87,11 +142,14 @@ def log_log_plot(
     """
     # Produce reverse-sorted index of values (e.g. total sales, record counts), with to the
     # cumulative number of items meeting or exceeding each one:
-    counts_cumsum = value_counts.sort_index(ascending=False).cumsum()
+    # (Working on the raw numpy arrays is much faster than Series.sort_index().cumsum())
+    values = value_counts.index.to_numpy()
+    order = np.argsort(values)[::-1]
+    counts_cumsum = np.cumsum(value_counts.to_numpy()[order])
     if xnorm:
-        counts_cumsum /= max(counts_cumsum)
+        counts_cumsum = counts_cumsum / counts_cumsum[-1]
     ax = plt.gca()
-    ax.plot(counts_cumsum, counts_cumsum.index, **kwargs)
+    ax.plot(counts_cumsum, values[order], **kwargs)
     ax.set_xscale("log")
     if xlabel is not None:
         ax.set_xlabel(xlabel)
@@ -7,10 +7,10 @@ with nested dicts.
 """
 # Python Built-Ins:
 from __future__ import annotations
+from math import prod
 from typing import Any, ClassVar, Dict, List, Optional
 
 # External Dependencies
-from numpy import product
 from numpy.random import default_rng
 from pandas import Timestamp
 
@@ -127,7 +127,7 @@ def generation_size_diagnostic(
     end_date: Timestamp,
 ) -> None:
     """Print a summary of the overall dataset size/shape to be generated"""
-    n_feature_perms = product([len(v) for v in features.values()])
+    n_feature_perms = prod(len(v) for v in features.values())
     print("Generating:")
     print(f" - {n_feature_perms} total time-series")
     print(f" - {(end_date - start_date).days / 365:.2f} years of historical data")
@@ -4,7 +4,8 @@
 from typing import Dict, List, Optional, Union
 
 # External Dependencies:
-from pandas import DataFrame, Period, PeriodIndex, Timedelta, Timestamp
+import numpy as np
+from pandas import DataFrame, MultiIndex, Period, PeriodIndex, Timedelta, Timestamp
 from timeseries_generator.external_factors import ExternalFactor
 
 
@@ -60,11 +61,11 @@ class ExternalDateAggregatedFactor(ExternalFactor):
                 else data_df[date_col_name]
             )
             if min_date is None:
-                min_date = min(dates)
+                min_date = dates.min()
                 if isinstance(min_date, Period):
                     min_date = min_date.start_time
             if max_date is None:
-                max_date = max(dates)
+                max_date = dates.max()
                 if isinstance(max_date, Period):
                     max_date = max_date.end_time
 
@@ -79,6 +80,18 @@ class ExternalDateAggregatedFactor(ExternalFactor):
         self._indexed_by_date = indexed_by_date
         self._data_df = data_df
 
+        # Cache date index metadata used for slicing in generate():
+        if indexed_by_date and isinstance(data_df.index, MultiIndex):
+            self._date_level_ix = data_df.index.names.index(date_col_name)
+            self._date_index = data_df.index.levels[self._date_level_ix]
+            self._is_period_index = isinstance(self._date_index, PeriodIndex)
+            self._date_index_freq = self._date_index.freq if self._is_period_index else None
+        else:
+            self._date_level_ix = None
+            self._date_index = None
+            self._is_period_index = False
+            self._date_index_freq = None
+
     def load_data(self) -> DataFrame:
         """Implement parent abstract method for data loading, but data is already loaded in init"""
         return self._data_df
@@ -103,51 +116,46 @@ class ExternalDateAggregatedFactor(ExternalFactor):
         data_df = self.load_data()
 
         # Slice the relevant section of the source data:
-        if self._indexed_by_date:
-            date_index_levelix = data_df.index.names.index(self._date_col_name)
-            date_index = data_df.index.levels[date_index_levelix]
-            if isinstance(date_index, PeriodIndex):
-                date_slice_start = Period(start_date, freq=date_index.freq)
-                date_slice_end = Period(end_date, freq=date_index.freq) + 1
+        if self._date_level_ix is not None:
+            date_index = self._date_index
+            if self._is_period_index:
+                date_slice_start = Period(start_date, freq=self._date_index_freq)
+                date_slice_end = Period(end_date, freq=self._date_index_freq) + 1
             else:
                 date_slice_start = start_date
                 date_slice_end = end_date + Timedelta(days=1)
-            data_df = data_df.loc[
-                tuple(
-                    slice(date_slice_start, date_slice_end)
-                    if ix == date_index_levelix
-                    else slice(None)
-                    for ix in range(len(data_df.index.levels))
-                ),
-                :,  # All columns
-            ]
+            # Compare the (few) unique date level values rather than every row's labels, and then
+            # select rows by their integer level codes:
+            level_in_range = np.asarray(
+                (date_index >= date_slice_start) & (date_index <= date_slice_end)
+            )
+            date_codes = data_df.index.codes[self._date_level_ix]
+            data_df = data_df.iloc[np.flatnonzero((date_codes >= 0) & level_in_range[date_codes])]
         else:
             raise NotImplementedError(
-                "generate() doesn't yet support data_df not *indexed* by date"
+                "generate() doesn't yet support data_df not *indexed* by date (in a MultiIndex)"
             )
 
         # Expand the aggregated time periods
-        if not isinstance(date_index, PeriodIndex):
+        if not self._is_period_index:
             # TODO: Should be doable to support others? But not required for our use case
             raise NotImplementedError(
                 "generate() doesn't yet support data_df not *indexed* by a pd.PeriodIndex"
             )
-        temp_date_col_name = self._date_col_name + "_final"
         datetimes = self.get_datetime_index(start_date=start_date, end_date=end_date)
-        datetimes = datetimes.to_series().reset_index(drop=True)
-        datetimes = DataFrame(
-            {
-                temp_date_col_name: datetimes,
-                "period": datetimes.dt.to_period("M"),
-            },
-        ).set_index("period")
-
-        data_df = data_df.reset_index(
-            [name for name in data_df.index.names if name != self._date_col_name]
-        )
-        data_df = data_df.join(datetimes, how="inner")
-        data_df = data_df.reset_index(drop=True).rename(
-            columns={temp_date_col_name: self._date_col_name}
-        )
+        datetimes_i8 = datetimes.asi8
+
+        # Find the (contiguous) range of sorted output datetimes covered by each source period:
+        periods = PeriodIndex(data_df.index.get_level_values(self._date_col_name))
+        dt_starts = np.searchsorted(datetimes_i8, periods.start_time.asi8, side="left")
+        dt_ends = np.searchsorted(datetimes_i8, periods.end_time.asi8, side="right")
+        n_dts = dt_ends - dt_starts
+        # ...And expand into (source row, output datetime) index pairs:
+        row_ixs = np.repeat(np.arange(len(data_df)), n_dts)
+        dt_ixs = np.arange(n_dts.sum()) + np.repeat(dt_starts - (np.cumsum(n_dts) - n_dts), n_dts)
+
+        data_df = data_df.droplevel(self._date_col_name).reset_index()
+        data_df = data_df.iloc[row_ixs].reset_index(drop=True)
+        data_df[self._date_col_name] = datetimes[dt_ixs]
 
         return data_df
@@ -1,14 +1,13 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 # Python Built-Ins:
-from itertools import product
+from copy import deepcopy
 from typing import Any, Dict, List, Optional, Union
 
 # External Dependencies:
 import numpy as np
-from pandas import DataFrame, Timestamp
+from pandas import Categorical, DataFrame, Series, Timestamp
 from timeseries_generator import BaseFactor
-from timeseries_generator.utils import get_cartesian_product
 
 
 class RandomCompositeFeatureFactor(BaseFactor):
@@ -25,6 +24,7 @@ class RandomCompositeFeatureFactor(BaseFactor):
         min_factor_value: float = 1.0,
         max_factor_value: float = 10.0,
         col_name: str = "random_feature_factor",
+        random_seed: Optional[Union[int, List[int]]] = None,
     ):
         """Create a RandomCompositeFeatureFactor
 
@@ -38,6 +38,10 @@ class RandomCompositeFeatureFactor(BaseFactor):
             Maximum factor value.
         col_name:
             Column name to create for this factor in the generation output.
+        random_seed:
+            Optional explicit seed for random number generation. If not provided, a seed is drawn
+            from numpy's global random state - so `np.random.seed()` still makes results
+            reproducible.
 
         Examples
         --------
@@ -60,26 +64,46 @@ class RandomCompositeFeatureFactor(BaseFactor):
             )
         self._min_factor_value = min_factor_value
         self._max_factor_value = max_factor_value
+        if random_seed is None:
+            random_seed = np.random.randint(2**32, dtype=np.int64)
+        self._rng = np.random.default_rng(random_seed)
+
+    def __copy__(self) -> "RandomCompositeFeatureFactor":
+        """Shallow copy, but with an independent copy of the random number generator state"""
+        result = self.__class__.__new__(self.__class__)
+        result.__dict__.update(self.__dict__)
+        result._rng = deepcopy(self._rng)
+        return result
 
     def generate(
         self,
         start_date: Union[Timestamp, str, int, float],
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
     ) -> DataFrame:
-        dr: DataFrame = self.get_datetime_index(start_date=start_date, end_date=end_date).to_frame(
-            index=False, name=self._date_col_name
-        )
+        dt_index = self.get_datetime_index(start_date=start_date, end_date=end_date)
 
-        # calculate product of all provided features and their values:
+        # calculate product of all provided features and their values (as categoricals, so that
+        # repeating labels for every date in the output stays cheap). Grid the label *indices*
+        # rather than the labels, to keep mixed-type label values as they are:
+        labels = [Series(v).to_numpy() for v in self._feature_values.values()]
+        grid_ixs = np.indices([len(vals) for vals in labels]).reshape(len(labels), -1)
         factor_df = DataFrame(
-            product(*self._feature_values.values()),
-            columns=[k for k in self._feature_values.keys()],
+            {
+                k: Categorical(vals[ixs])
+                for k, vals, ixs in zip(self._feature_values.keys(), labels, grid_ixs)
+            }
         )
         # generate a random factor value for each feature combination:
-        # rand_value = min + ((max - min) * value)
-        factor_df[self._col_name] = self._min_factor_value + (
-            (self._max_factor_value - self._min_factor_value) * np.random.random(len(factor_df))
+        factor_df[self._col_name] = self._rng.uniform(
+            self._min_factor_value, self._max_factor_value, len(factor_df)
         )
 
-        # cartesian product of factor df and datetime df
-        return get_cartesian_product(dr, factor_df)
+        # cartesian product of factor df and datetime df, in the same (date-major) order as
+        # timeseries_generator's get_cartesian_product:
+        n_dates, n_perms = len(dt_index), len(factor_df)
+        result = DataFrame({self._date_col_name: dt_index.repeat(n_perms)})
+        for k in self._feature_values.keys():
+            cat = factor_df[k].array
+            result[k] = Categorical.from_codes(np.tile(cat.codes, n_dates), cat.categories)
+        result[self._col_name] = np.tile(factor_df[self._col_name].to_numpy(), n_dates)
+        return result
@@ -1,16 +1,57 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 # Python Built-Ins:
-from itertools import product
-from math import modf
-import time
-from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+from math import ceil
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # External Dependencies:
 import numpy as np
-from pandas import DataFrame, Timedelta, Timestamp
+from pandas import DataFrame, Series, Timestamp
 from timeseries_generator import BaseFactor
-from timeseries_generator.utils import get_cartesian_product
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: Without it, the promo kernel just runs as (slower) plain Python.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def _fill_promos(
+    values: np.ndarray,
+    gaps: np.ndarray,
+    durations: np.ndarray,
+    impacts: np.ndarray,
+    perm_ix: int,
+    cursor: int,
+) -> Tuple[int, int]:
+    """Write promotion events into `values` (feature permutation x day), in place
+
+    Consumes (gap, duration, impact) samples in order, starting from `perm_ix` at day `cursor`. If
+    the samples run out before all permutations are filled, returns the (perm_ix, cursor) from
+    which to resume with a fresh batch of samples.
+    """
+    n_perms, n_days = values.shape
+    n_samples = len(gaps)
+    k = 0
+    while perm_ix < n_perms:
+        while cursor < n_days:
+            if k >= n_samples:
+                return perm_ix, cursor
+            start = cursor + gaps[k]
+            if start >= n_days:
+                k += 1
+                break  # Can't add the event - it already starts too late.
+            end = start + durations[k] + 1
+            values[perm_ix, start : end + 1] = impacts[k]
+            k += 1
+            cursor = end
+        perm_ix += 1
+        cursor = 0
+    return perm_ix, cursor
 
 
 class RandomPromotionsFactor(BaseFactor):
@@ -55,8 +96,8 @@ class RandomPromotionsFactor(BaseFactor):
         col_name :
             Name of the output factor column in the final dataframe
         random_seed :
-            Optional explicit seed for random number generation. If not provided, a seed based on
-            the current `time.time()` at __init__ invocation will be used.
+            Optional explicit seed for random number generation. If not provided, fresh entropy
+            will be sampled at __init__ invocation (see `np.random.SeedSequence`).
         """
         super().__init__(col_name=col_name, features=feature_values)
 
@@ -68,27 +109,31 @@ class RandomPromotionsFactor(BaseFactor):
         # Generate the random states at the point of __init__, not generate(), so that this factor
         # can be inverted correctly (generate() returns same each time).
         if random_seed is None:
-            curr_time_subsec, curr_time_secs = modf(time.time())
-            random_seed = [round(curr_time_secs), round(curr_time_subsec * 10**6)]
+            random_seed = np.random.SeedSequence().entropy
         self._random_seed = random_seed
 
     def _load_rng(self) -> np.random.Generator:
         return np.random.default_rng(self._random_seed)
 
-    def gen_random_params(
+    def sample_random_params(
         self,
         rng: np.random.Generator,
-    ) -> Generator[Tuple[int, int, float], None, None]:
-        """Iterate random (time-to-start, duration, impact) tuples for promo event generation
+        size: int,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sample arrays of random (time-to-start, duration, impact) for promo event generation
 
-        TODO: Batch the actual random number generation here for efficiency
+        Draws are interleaved per event (gap, duration, impact, gap, ...), so the sampled stream is
+        the same as drawing each event's parameters one at a time, regardless of batch size.
         """
-        while True:
-            yield (
-                round(rng.exponential(self._promo_rate)),
-                max(1, round(rng.exponential(self._promo_end_rate))),
-                1.0 + rng.exponential(self._exp_impact),
-            )
+        samples = rng.standard_exponential((size, 3)) * (
+            self._promo_rate,
+            self._promo_end_rate,
+            self._exp_impact,
+        )
+        gaps = samples[:, 0].round().astype(np.int64)
+        durations = np.maximum(1, samples[:, 1].round().astype(np.int64))
+        impacts = 1.0 + samples[:, 2]
+        return gaps, durations, impacts
 
     def generate(
         self,
@@ -96,35 +141,32 @@ class RandomPromotionsFactor(BaseFactor):
         end_date: Optional[Union[Timestamp, str, int, float]] = None,
     ) -> DataFrame:
         dt_index = self.get_datetime_index(start_date=start_date, end_date=end_date)
-        dt_index_start = min(dt_index)
-        dt_index_end = max(dt_index)
 
-        # calculate product of all provided features and their values:
+        # calculate product of all provided features and their values. Grid the label *indices*
+        # rather than the labels, to keep mixed-type label values as they are:
+        labels = [Series(v).to_numpy() for v in self._feature_values.values()]
+        grid_ixs = np.indices([len(vals) for vals in labels]).reshape(len(labels), -1)
         factor_df = DataFrame(
-            product(*self._feature_values.values()),
-            columns=[k for k in self._feature_values.keys()],
+            {k: vals[ixs] for k, vals, ixs in zip(self._feature_values.keys(), labels, grid_ixs)}
         )
-        factor_df[self._col_name] = 1.0  # Init this factor to 1.0 everywhere
-        result = get_cartesian_product(
-            dt_index.to_frame(index=False, name=self._date_col_name), factor_df
-        ).set_index([self._date_col_name] + [k for k in self._feature_values.keys()])
+        n_perms = len(factor_df)
+        n_days = len(dt_index)
+        # Init this factor to 1.0 everywhere, as a dense (feature permutation x date) array:
+        values = np.ones((n_perms, n_days), dtype=np.float64)
 
         # For each feature combination, generate promotions until the target time period is
-        # exceeded:
-        random_generator = self.gen_random_params(self._load_rng())
-        for index, factor_record in factor_df.iterrows():
-            cursor = dt_index_start
-            events = []
-            while cursor <= dt_index_end:
-                next_event = next(random_generator)
-                start = cursor + Timedelta(days=next_event[0])
-                if start > dt_index_end:
-                    break  # Can't add the event - it already starts too late.
-                end = start + Timedelta(days=next_event[1] + 1)
-                result.loc[
-                    tuple([slice(start, end)] + [*factor_record][:-1]), self._col_name
-                ] = next_event[2]
-                events.append(next_event)
-                cursor = end
-
-        return result.reset_index()
+        # exceeded. Samples are drawn in batches sized to (usually) cover the whole generation:
+        rng = self._load_rng()
+        batch_size = max(1024, n_perms * ceil(n_days / max(self._promo_rate, 1)) * 2)
+        perm_ix, cursor = 0, 0
+        while perm_ix < n_perms:
+            perm_ix, cursor = _fill_promos(
+                values, *self.sample_random_params(rng, batch_size), perm_ix, cursor
+            )
+
+        # Assemble the output in (date, *features) order, as per get_cartesian_product:
+        result = DataFrame({self._date_col_name: dt_index.repeat(n_perms)})
+        for k in self._feature_values.keys():
+            result[k] = np.tile(factor_df[k].to_numpy(), n_days)
+        result[self._col_name] = values.T.ravel()
+        return result
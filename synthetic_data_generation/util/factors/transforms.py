@@ -6,44 +6,94 @@ WARNING: These transforms will only map to originals on factors that are determi
 they're transformed! If your factor employs random numbers in generate() and doesn't re/seed the RNG
 with the same static value each time, then your original factor and the transformed copy won't
 correspond to each other after generation.
+
+Transformed factors wrap a *shallow* copy of the original (so large source data is not duplicated).
+Factors that mutate internal state during generate() should implement `__copy__` to give the copy
+its own instance of that state.
 """
 # Python Built-Ins:
-from copy import deepcopy
-from types import MethodType
-from typing import Optional, Union
+from copy import copy
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # External Dependencies:
+import numpy as np
 from pandas import DataFrame, Timestamp
 from timeseries_generator import BaseFactor
 
 
-def invert_factor(factor: BaseFactor) -> BaseFactor:
-    """Create a deep copy of `factor` which generate()s the inverse of the original"""
-    factor = deepcopy(factor)
-    generate_original = factor.generate
+def _invert_inplace(values: np.ndarray, param: Any = None) -> None:
+    np.divide(1.0, values, out=values)
 
-    def generate(
-        self,
-        start_date: Optional[Union[Timestamp, str, int, float]],
-        end_date: Optional[Union[Timestamp, str, int, float]] = None,
-        *args,
-        **kwargs,
-    ) -> DataFrame:
-        df = generate_original(start_date, end_date, *args, **kwargs)
-        df[self.col_name] = 1.0 / df[self.col_name]
-        return df
 
-    factor.generate = MethodType(generate, factor)
-    return factor
+def _scale_inplace(values: np.ndarray, param: Any) -> None:
+    scale, base = param
+    if base != 0:
+        np.subtract(values, base, out=values)
+    np.multiply(values, scale, out=values)
+    if base != 0:
+        np.add(values, base, out=values)
 
 
-def scale_factor(factor: BaseFactor, scale: float = 1.0, base: float = 0.0) -> BaseFactor:
-    """Create a deep copy of `factor` which generate()s a scaled version of the original
+class TransformedFactor(BaseFactor):
+    """A factor that generate()s the output of a wrapped factor, post-processed by array operations
 
-    `base` is the static offset around which scaling should be applied (e.g. typical choices 0 or 1)
+    Transforms are accumulated in one flat list rather than nesting wrappers, so chains like
+    `scale_factor(invert_factor(f))` process the output column only once. Column names and features
+    are shared with the wrapped factor, and other attributes are looked up on it too.
     """
-    factor = deepcopy(factor)
-    generate_original = factor.generate
+
+    def __init__(
+        self,
+        base_factor: BaseFactor,
+        ops: List[Tuple[Callable[[np.ndarray, Any], None], Any]],
+    ):
+        """Create a TransformedFactor
+
+        Parameters
+        ----------
+        base_factor :
+            The (untransformed) factor to wrap. This is used as-is, not copied.
+        ops :
+            List of (op, param) pairs to apply in order, where each `op(values, param)` modifies the
+            float64 array `values` of the factor's output column in place.
+        """
+        # (No super().__init__(): Column names & features are all delegated to base_factor)
+        self._base_factor = base_factor
+        self._transform_ops = ops
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found normally. Guard against recursion while unpickling:
+        if name.startswith("__") or name in ("_base_factor", "_transform_ops"):
+            raise AttributeError(name)
+        return getattr(self._base_factor, name)
+
+    @property
+    def col_name(self) -> str:
+        return self._base_factor.col_name
+
+    @col_name.setter
+    def col_name(self, name: str):
+        self._base_factor.col_name = name
+
+    @property
+    def features(self) -> Dict[str, List[str]]:
+        return self._base_factor.features
+
+    @features.setter
+    def features(self, keys: Dict[str, List[str]]):
+        self._base_factor.features = keys
+
+    @property
+    def date_col_name(self) -> str:
+        return self._base_factor.date_col_name
+
+    @date_col_name.setter
+    def date_col_name(self, name: str):
+        self._base_factor.date_col_name = name
+
+    @property
+    def apply_to_all(self) -> bool:
+        return self._base_factor.apply_to_all
 
     def generate(
         self,
@@ -52,12 +102,37 @@ def scale_factor(factor: BaseFactor, scale: float = 1.0, base: float = 0.0) -> B
         *args,
         **kwargs,
     ) -> DataFrame:
-        df = generate_original(start_date, end_date, *args, **kwargs)
-        if base == 0:
-            df[self.col_name] = df[self.col_name] * scale
-        else:
-            df[self.col_name] = base + ((df[self.col_name] - base) * scale)
+        df = self._base_factor.generate(start_date, end_date, *args, **kwargs)
+        values = df[self.col_name].to_numpy(dtype=np.float64, copy=True)
+        for op, param in self._transform_ops:
+            op(values, param)
+        df[self.col_name] = values
         return df
 
-    factor.generate = MethodType(generate, factor)
-    return factor
+
+def _add_transform(
+    factor: BaseFactor,
+    op: Callable[[np.ndarray, Any], None],
+    param: Any = None,
+) -> TransformedFactor:
+    """Create a transformed copy of `factor` with in-place array operation `op` applied to output
+
+    Each result wraps its own (shallow) copy of the untransformed factor, so transformed factors
+    don't share e.g. random number generator state with the original or with each other.
+    """
+    if isinstance(factor, TransformedFactor):
+        return TransformedFactor(copy(factor._base_factor), factor._transform_ops + [(op, param)])
+    return TransformedFactor(copy(factor), [(op, param)])
+
+
+def invert_factor(factor: BaseFactor) -> BaseFactor:
+    """Create a copy of `factor` which generate()s the inverse of the original"""
+    return _add_transform(factor, _invert_inplace)
+
+
+def scale_factor(factor: BaseFactor, scale: float = 1.0, base: float = 0.0) -> BaseFactor:
+    """Create a copy of `factor` which generate()s a scaled version of the original
+
+    `base` is the static offset around which scaling should be applied (e.g. typical choices 0 or 1)
+    """
+    return _add_transform(factor, _scale_inplace, (scale, base))
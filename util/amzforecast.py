@@ -2,19 +2,35 @@
 # SPDX-License-Identifier: MIT-0
 """Helper utilities for working with Amazon Forecast from Python notebooks"""
 # Python Built-Ins:
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cache, partial
+from hashlib import blake2b
 import json
 import re
-from typing import Dict, List, Literal, Optional, TypedDict
+import time
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypedDict, TypeVar, Union
 
 # External Dependencies:
 import boto3  # General-purpose AWS SDK for Python
 import pandas as pd  # Tabular data processing tools
 
 
-forecast = boto3.client("forecast")
-s3 = boto3.resource("s3")
-s3client = boto3.client("s3")
+# boto3 clients are created lazily on first use, so importing this module (e.g. just for schema
+# discovery) doesn't pay for loading AWS service models or require AWS configuration:
+@cache
+def _forecast():
+    """Shared boto3 Amazon Forecast client"""
+    return boto3.client("forecast")
+
+
+@cache
+def _s3client():
+    """Shared boto3 Amazon S3 client"""
+    return boto3.client("s3")
+
+
+TResponse = TypeVar("TResponse")
 
 
 class AmazonForecastResourceDescDict(TypedDict):
@@ -66,15 +82,39 @@ def is_forecast_resource_ready(desc: AmazonForecastResourceDescDict) -> bool:
     return False
 
 
+# Amazon Forecast AttributeTypes for numeric numpy/pandas dtype.kind codes:
+_NUMERIC_KIND_ATTRIBUTE_TYPES = {
+    "b": "float",  # (Booleans are numeric but not integer, to pandas)
+    "c": "float",
+    "f": "float",
+    "i": "integer",
+    "u": "integer",
+}
+
+# Amazon Forecast AttributeTypes for non-string `pandas.api.types.infer_dtype` results, for object
+# (or other non-native) columns:
+_INFERRED_ATTRIBUTE_TYPES = {
+    "boolean": "float",
+    "date": "timestamp",
+    "datetime": "timestamp",
+    "datetime64": "timestamp",
+    "decimal": "float",
+    "floating": "float",
+    "integer": "integer",
+    "mixed-integer-float": "float",
+}
+
+# Max leading rows of an object column to scan when inferring its type (bounds cost on big data):
+_INFER_DTYPE_MAX_ROWS = 1_000_000
+
+
+_US_ZIP_RE = re.compile(r"US_\d{5,}")  # US zip code GeoLocation format
+_LATLON_RE = re.compile(r"-?\d+\.\d+_-?\d+\.\d+")  # Lat_Long GeoLocation format
+
+
 def _looks_like_geolocation(value: str) -> bool:
     """Determine whether a field value seems to be in Amazon Forecast GeoLocation format"""
-    if re.match("US_\d{5,}", value):
-        # US zip code format
-        return True
-    elif re.match("-?\d+\.\d+_-?\d+\.\d+", value):
-        # Lat_Long format
-        return True
-    return False
+    return bool(_US_ZIP_RE.match(value) or _LATLON_RE.match(value))
 
 
 def autodiscover_dataframe_schema(
@@ -94,80 +134,188 @@ def autodiscover_dataframe_schema(
     schema = []
     if not overrides:
         overrides = {}
-    for colname in df:
-        series = df[colname]
+    # Dispatch on the dtypes Series, only touching column data where values need inspecting:
+    for ix, (colname, dtype) in enumerate(zip(df.columns, df.dtypes)):
+        kind = dtype.kind
         col_schema = {"AttributeName": colname}
         if colname in overrides:
             col_schema["AttributeType"] = overrides[colname]
-        elif pd.api.types.is_datetime64_any_dtype(series) or "timestamp" in colname.lower():
+        elif kind == "M" or "timestamp" in colname.lower():
             col_schema["AttributeType"] = "timestamp"
-        elif pd.api.types.is_integer_dtype(series):
-            col_schema["AttributeType"] = "integer"
-        elif pd.api.types.is_numeric_dtype(series):
-            col_schema["AttributeType"] = "float"
-        elif pd.api.types.is_string_dtype(series) or pd.api.types.is_object_dtype(series):
-            if all(map(_looks_like_geolocation, series.iloc[:10])):
-                col_schema["AttributeType"] = "geolocation"
-            else:
+        elif kind in _NUMERIC_KIND_ATTRIBUTE_TYPES:
+            col_schema["AttributeType"] = _NUMERIC_KIND_ATTRIBUTE_TYPES[kind]
+        elif kind in ("O", "U", "S"):
+            sample = df.iloc[:_INFER_DTYPE_MAX_ROWS, ix]
+            inferred = pd.api.types.infer_dtype(
+                dtype.categories if isinstance(dtype, pd.CategoricalDtype) else sample,
+                skipna=True,
+            )
+            if inferred in _INFERRED_ATTRIBUTE_TYPES:
+                col_schema["AttributeType"] = _INFERRED_ATTRIBUTE_TYPES[inferred]
+            elif inferred != "string":
                 col_schema["AttributeType"] = "string"
+            else:
+                col_schema["AttributeType"] = "geolocation"
+                for value in sample.dropna().head(10).to_numpy():
+                    if not _looks_like_geolocation(value):
+                        col_schema["AttributeType"] = "string"
+                        break
         else:
             raise ValueError(
                 "Couldn't infer Amazon Forecast schema AttributeType for column %s with dtype: %s"
-                % (colname, series.dtype)
+                % (colname, dtype)
             )
         schema.append(col_schema)
     return schema
 
 
-def extract_arn_from_message(msg: str, prefix_regex="arn:aws:forecast:") -> Optional[str]:
-    """Try to extract an ARN from a message/string (returning None if no ARN found)"""
-    arn = None
-    for word in msg.split():
-        if re.match(prefix_regex, word):
-            arn = word
-    return arn
+def _arn_regex(prefix_regex: str) -> re.Pattern:
+    """Compile a regex matching whole whitespace-separated words that start with `prefix_regex`"""
+    return re.compile(r"(?<!\S)(?:" + prefix_regex + r")\S*")
 
 
-def hash_s3_data(s3uri: str) -> str:
-    """Calculate a hash for an object or prefix on S3.
+_ARN_FORECAST_RE = _arn_regex("arn:aws:forecast:")
+
 
-    If s3uri points to an individual object, the S3 ETag is used. If a folder, this function loops
-    through all objects under the prefix and returns a string based on the most recent object
-    modification timestamp.
+def extract_arn_from_message(
+    msg: str,
+    prefix_regex: Union[str, re.Pattern] = _ARN_FORECAST_RE,
+) -> Optional[str]:
+    """Try to extract an ARN from a message/string (returning None if no ARN found)
 
-    NOTE: This may be slow for large S3 folders, as HeadObject will be called on *every* object
-    under the `s3uri` prefix.
+    If multiple ARNs are present, the last one is returned. `prefix_regex` may be either a plain
+    string regex for the start of the ARN (e.g. "arn:aws:s3:"), or a compiled pattern matching the
+    whole ARN.
     """
+    if isinstance(prefix_regex, str):
+        prefix_regex = _arn_regex(prefix_regex)
+    matches = prefix_regex.findall(msg)
+    return matches[-1] if matches else None
+
+
+def _parse_s3_uri(s3uri: str) -> Tuple[str, str]:
+    """Split an 's3://bucket/key' URI into (bucket, key)"""
     if not s3uri.lower().startswith("s3://"):
         raise ValueError(f"s3uri must start with 's3://'. Got: {s3uri}")
-    bucket, _, key = s3uri[len("s3://") :].partition("/")
+    slash_ix = s3uri.find("/", 5)
+    return (s3uri[5:], "") if slash_ix < 0 else (s3uri[5:slash_ix], s3uri[slash_ix + 1 :])
+
+
+def _scan_s3_prefix(
+    bucket: str,
+    prefix: str,
+    delimiter: Optional[str] = None,
+) -> Tuple[Optional[str], List[str]]:
+    """List objects under an S3 prefix, returning (listing fingerprint, common prefixes)
+
+    The fingerprint is a hash of every listed object's key, ETag and last modified timestamp, or
+    None if no objects were found. Common prefixes (sub-folders) are only returned if a `delimiter`
+    is set - otherwise all nested objects are listed directly.
+    """
+    hasher = blake2b()
+    n_objects = 0
+    common_prefixes = []
+    paginator = _s3client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=bucket,
+        Prefix=prefix,
+        PaginationConfig={"PageSize": 1000},
+        **({"Delimiter": delimiter} if delimiter else {}),
+    ):
+        for obj in page.get("Contents", ()):
+            hasher.update(
+                f"{obj['Key']}\t{obj['ETag']}\t{obj['LastModified'].isoformat()}\n".encode()
+            )
+            n_objects += 1
+        common_prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", ()))
+    return (hasher.hexdigest() if n_objects else None), common_prefixes
+
+
+# Above this many sub-folders per worker thread, a parallel per-folder listing would need more
+# (mostly tiny) requests than a single flat listing of 1000-key pages, so hash_s3_data skips it:
+_MAX_S3_SUBPREFIXES_PER_WORKER = 4
+
+
+def hash_s3_data(s3uri: str, max_workers: int = 16) -> str:
+    """Calculate a hash for an object or prefix on S3.
+
+    If s3uri points to an individual object, the S3 ETag is used. If a folder, this function lists
+    all objects under the prefix and returns a hash of their keys, ETags and last modified
+    timestamps - so the hash changes if any object is added, removed or modified. Sub-folders are
+    listed in parallel using up to `max_workers` threads, unless there are so many that a single
+    flat listing is cheaper (e.g. many small Hive-style partitions).
+
+    NOTE: This may be slow for very large S3 folders, as *every* object under the `s3uri` prefix
+    must be listed.
+    """
+    bucket, key = _parse_s3_uri(s3uri)
 
     try:
         # If the URI is a single object, return its ETag hash:
-        headobj = s3client.head_object(
+        headobj = _s3client().head_object(
             Bucket=bucket,
             Key=key,
         )
         return json.loads(headobj["ETag"]).replace("-", "_")
-    except s3client.exceptions.ClientError as ex:
+    except _s3client().exceptions.ClientError as ex:
         # If ResourceNotFound, try to treat it as a prefix. Raise any other errors:
         if ex.response["Error"]["Code"] != "404":
             raise ex
 
-    # Try to look up last modified timestamp for a prefix:
-    latest_mod_dt = max(
-        objsumm.last_modified for objsumm in s3.Bucket(bucket).objects.filter(Prefix=key)
-    )
-    return f"mod{datetime.timestamp(latest_mod_dt)}".replace(".", "_")
+    # Try to fingerprint the object listing for a prefix. First list the top level (descending
+    # through any levels that contain just a single folder):
+    scan_prefix = key
+    top_hash, subprefixes = _scan_s3_prefix(bucket, scan_prefix, delimiter="/")
+    while top_hash is None and len(subprefixes) == 1:
+        scan_prefix = subprefixes[0]
+        top_hash, subprefixes = _scan_s3_prefix(bucket, scan_prefix, delimiter="/")
+    if len(subprefixes) > max_workers * _MAX_S3_SUBPREFIXES_PER_WORKER:
+        # Too many sub-folders to fan out over: Fall back to one flat, paginated listing:
+        flat_hash, _ = _scan_s3_prefix(bucket, scan_prefix)
+        if flat_hash is None:
+            raise ValueError(f"No objects found under s3uri: {s3uri}")
+        return flat_hash[:32]
+    hasher = blake2b(f"{top_hash}\n".encode())
+    any_objects = top_hash is not None
+    # ...Then list any sub-folders in parallel, since listing is latency-bound:
+    if subprefixes:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(subprefixes))) as executor:
+            sub_hashes = executor.map(partial(_scan_s3_prefix, bucket), subprefixes)
+            for subprefix, (sub_hash, _) in zip(subprefixes, sub_hashes):
+                hasher.update(f"{subprefix}\t{sub_hash}\n".encode())
+                any_objects = any_objects or sub_hash is not None
+    if not any_objects:
+        raise ValueError(f"No objects found under s3uri: {s3uri}")
+    return hasher.hexdigest()[:32]
+
+
+def _call_with_role_retry(
+    fn: Callable[..., TResponse],
+    max_attempts: int = 6,
+    **kwargs,
+) -> TResponse:
+    """Call an Amazon Forecast API with an IAM RoleArn, retrying while a new role propagates
+
+    Newly created IAM roles can take several seconds before Amazon Forecast is able to assume them,
+    so retry (with exponential backoff) on InvalidInputExceptions that mention the role.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn(**kwargs)
+        except _forecast().exceptions.InvalidInputException as ex:
+            if attempt + 1 >= max_attempts or "role" not in ex.response["Error"]["Message"].lower():
+                raise ex
+            delay_secs = 2**attempt
+            print(f"Waiting {delay_secs}s for IAM role to propagate...")
+            time.sleep(delay_secs)
 
 
 def create_dataset_import_job_by_hash(**kwargs) -> str:
     """Create a Forecast dataset import jab iff data has changed in Amazon S3
 
     This function works like boto3 forecast.create_dataset_import_job, but inspects the hash (for
-    single files) or last modified timestamp (for folders) of S3 data: Automatically naming the
-    import job based on the version of the data and re-using the pre-existing job if the data has
-    not changed.
+    single files) or object listing (for folders) of S3 data: Automatically naming the import job
+    based on the version of the data and re-using the pre-existing job if the data has not changed.
 
     NOTE: Can be inefficient/slow for large folders - see `hash_s3_data()` for details.
     """
@@ -179,7 +327,7 @@ def create_dataset_import_job_by_hash(**kwargs) -> str:
             % kwargs.get("DataSource")
         ) from ke
 
-    dataset_name = kwargs["DatasetArn"].partition("/")[2]
+    dataset_name = kwargs["DatasetArn"].rsplit("/", 1)[-1]
     data_hash = hash_s3_data(data_s3uri)
     MAX_JOB_NAME_LEN = 63
     job_name = dataset_name[:50] + "_"  # At most 50 chars from *beginning* of dataset name
@@ -188,10 +336,10 @@ def create_dataset_import_job_by_hash(**kwargs) -> str:
     kwargs["DatasetImportJobName"] = job_name
 
     try:
-        resp = forecast.create_dataset_import_job(**kwargs)
+        resp = _call_with_role_retry(_forecast().create_dataset_import_job, **kwargs)
         job_arn = resp["DatasetImportJobArn"]
         print(f"Created Dataset Import Job: {job_arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
+    except _forecast().exceptions.ResourceAlreadyExistsException as ex:
         job_arn = extract_arn_from_message(ex.response["Error"]["Message"])
         if job_arn is None:
             raise ValueError("Couldn't determine ARN of existing Dataset Import Job") from ex
@@ -199,39 +347,67 @@ def create_dataset_import_job_by_hash(**kwargs) -> str:
     return job_arn
 
 
-def create_or_reuse_dataset_group(**kwargs) -> str:
-    """Thin wrapper over forecast.create_dataset_group(), to re-use existing DSG by name
+# In-process cache of resource ARNs by (create method name, resource name), so re-running notebook
+# cells doesn't repeat Create* API calls for resources already created/found. Call
+# `_arn_cache.clear()` if resources get deleted during the session:
+_arn_cache: Dict[Tuple[str, str], str] = {}
 
-    Returns the ARN of the new dataset group, or the existing one if one already exists by this
-    name.
+
+def _create_or_reuse(method_name: str, arn_key: str, label: str, kwargs: Dict[str, Any]) -> str:
+    """Call a Forecast Create* API, or look up the existing resource's ARN if it already exists
+
+    Parameters
+    ----------
+    method_name :
+        Name of the boto3 Forecast client Create* method to call, e.g. "create_dataset"
+    arn_key :
+        Key of the created resource's ARN in the API response, e.g. "DatasetArn"
+    label :
+        Human-readable resource type name for logging, e.g. "Dataset"
+    kwargs :
+        Keyword arguments for the Create* API call. The resource name is expected in the argument
+        corresponding to `arn_key` (e.g. "DatasetName" for "DatasetArn"), and results are cached
+        by it in `_arn_cache`.
+
+    Returns
+    -------
+    arn :
+        The ARN of the new resource, or the existing one if one already exists by this name.
     """
+    cache_key = (method_name, kwargs.get(arn_key[: -len("Arn")] + "Name"))
+    if cache_key in _arn_cache:
+        arn = _arn_cache[cache_key]
+        print(f"Using pre-existing {label}: {arn}")
+        return arn
     try:
-        resp = forecast.create_dataset_group(**kwargs)
-        arn = resp["DatasetGroupArn"]
-        print(f"Created Dataset Group: {arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
+        resp = getattr(_forecast(), method_name)(**kwargs)
+        arn = resp[arn_key]
+        print(f"Created {label}: {arn}")
+    except _forecast().exceptions.ResourceAlreadyExistsException as ex:
         arn = extract_arn_from_message(ex.response["Error"]["Message"])
         if arn is None:
-            raise ValueError("Couldn't determine ARN of existing Dataset Group") from ex
-        print(f"Using pre-existing Dataset Group: {arn}")
+            raise ValueError(f"Couldn't determine ARN of existing {label}") from ex
+        print(f"Using pre-existing {label}: {arn}")
+    if cache_key[1] is not None:
+        _arn_cache[cache_key] = arn
     return arn
 
 
+def create_or_reuse_dataset_group(**kwargs) -> str:
+    """Thin wrapper over forecast.create_dataset_group(), to re-use existing DSG by name
+
+    Returns the ARN of the new dataset group, or the existing one if one already exists by this
+    name.
+    """
+    return _create_or_reuse("create_dataset_group", "DatasetGroupArn", "Dataset Group", kwargs)
+
+
 def create_or_reuse_dataset(**kwargs) -> str:
     """Thin wrapper over forecast.create_dataset(), to re-use existing dataset by name
 
     Returns the ARN of the new dataset, or the existing one if one already exists by this name.
     """
-    try:
-        response = forecast.create_dataset(**kwargs)
-        arn = response["DatasetArn"]
-        print(f"Created Dataset: {arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
-        arn = extract_arn_from_message(ex.response["Error"]["Message"])
-        if arn is None:
-            raise ValueError("Couldn't determine ARN of existing Dataset") from ex
-        print(f"Using pre-existing Dataset {arn}")
-    return arn
+    return _create_or_reuse("create_dataset", "DatasetArn", "Dataset", kwargs)
 
 
 def create_or_reuse_auto_predictor(**kwargs) -> str:
@@ -239,16 +415,7 @@ def create_or_reuse_auto_predictor(**kwargs) -> str:
 
     Returns the ARN of the new predictor, or the existing one if one already exists by this name.
     """
-    try:
-        response = forecast.create_auto_predictor(**kwargs)
-        arn = response["PredictorArn"]
-        print(f"Created AutoPredictor: {arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
-        arn = extract_arn_from_message(ex.response["Error"]["Message"])
-        if arn is None:
-            raise ValueError("Couldn't determine ARN of existing AutoPredictor") from ex
-        print(f"Using pre-existing AutoPredictor {arn}")
-    return arn
+    return _create_or_reuse("create_auto_predictor", "PredictorArn", "AutoPredictor", kwargs)
 
 
 def create_or_reuse_predictor_backtest_export_job(**kwargs) -> str:
@@ -256,16 +423,12 @@ def create_or_reuse_predictor_backtest_export_job(**kwargs) -> str:
 
     Returns the ARN of the new export job, or the existing one if one already exists by this name.
     """
-    try:
-        response = forecast.create_predictor_backtest_export_job(**kwargs)
-        arn = response["PredictorBacktestExportJobArn"]
-        print(f"Created backtest export job: {arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
-        arn = extract_arn_from_message(ex.response["Error"]["Message"])
-        if arn is None:
-            raise ValueError("Couldn't determine ARN of existing backtest export job") from ex
-        print(f"Using pre-existing backtest export job {arn}")
-    return arn
+    return _create_or_reuse(
+        "create_predictor_backtest_export_job",
+        "PredictorBacktestExportJobArn",
+        "backtest export job",
+        kwargs,
+    )
 
 
 def create_or_reuse_forecast(**kwargs) -> str:
@@ -273,16 +436,7 @@ def create_or_reuse_forecast(**kwargs) -> str:
 
     Returns the ARN of the new forecast, or the existing one if one already exists by this name.
     """
-    try:
-        response = forecast.create_forecast(**kwargs)
-        arn = response["ForecastArn"]
-        print(f"Created forecast: {arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
-        arn = extract_arn_from_message(ex.response["Error"]["Message"])
-        if arn is None:
-            raise ValueError("Couldn't determine ARN of existing forecast") from ex
-        print(f"Using pre-existing forecast {arn}")
-    return arn
+    return _create_or_reuse("create_forecast", "ForecastArn", "forecast", kwargs)
 
 
 def create_or_reuse_forecast_export_job(**kwargs) -> str:
@@ -290,13 +444,6 @@ def create_or_reuse_forecast_export_job(**kwargs) -> str:
 
     Returns the ARN of the new export job, or the existing one if one already exists by this name.
     """
-    try:
-        response = forecast.create_forecast_export_job(**kwargs)
-        arn = response["ForecastExportJobArn"]
-        print(f"Created forecast export job: {arn}")
-    except forecast.exceptions.ResourceAlreadyExistsException as ex:
-        arn = extract_arn_from_message(ex.response["Error"]["Message"])
-        if arn is None:
-            raise ValueError("Couldn't determine ARN of existing forecast export job") from ex
-        print(f"Using pre-existing forecast export job {arn}")
-    return arn
+    return _create_or_reuse(
+        "create_forecast_export_job", "ForecastExportJobArn", "forecast export job", kwargs
+    )
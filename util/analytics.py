@@ -6,9 +6,15 @@ from datetime import datetime
 import re
 
 # External Dependencies:
+import numpy as np
 import pandas as pd
 
 
+_ISO_T_RE = re.compile(r"\d{4}-\d{2}-\d{2}T")  # e.g. 2000-01-01T12:00:00 (maybe with timezone)
+_ISO_SPACE_RE = re.compile(r"\d{4}-\d{2}-\d{2} ")  # e.g. 2000-01-01 12:00:00
+_ISO_TRUNC_RE = re.compile(r"\d{4}(-\d{2}){0,2}")  # e.g. 2000-01-01, 2000-01, 2000
+
+
 def filter_to_period(
     df: pd.DataFrame,
     period_start: datetime,
@@ -18,14 +24,22 @@ def filter_to_period(
     """Filter a DataFrame to a particular date/time range (including start, excluding end)
 
     Handles string, datetime, or period type timestamp columns, and checks that the result is not
-    empty.
+    empty. The result is a shallow copy that may share underlying data with `df`: Replace columns
+    rather than modifying their values in-place, if you need to keep `df` unchanged.
     """
     n_raw = len(df)
     if timestamp_col_name not in df.columns:
         raise ValueError(f"Timestamp column '{timestamp_col_name}' not found in DataFrame")
 
     timestamp_dtype = df[timestamp_col_name].dtype
-    if pd.api.types.is_datetime64_any_dtype(timestamp_dtype):
+    if (
+        pd.api.types.is_datetime64_any_dtype(timestamp_dtype)
+        and df[timestamp_col_name].is_monotonic_increasing
+    ):
+        # DataFrame timestamp column is parsed as datetimes *and* sorted: Binary search is enough
+        ix_start, ix_end = df[timestamp_col_name].searchsorted([period_start, period_end])
+        result = df.iloc[ix_start:ix_end]
+    elif pd.api.types.is_datetime64_any_dtype(timestamp_dtype):
         # DataFrame timestamp column is already parsed as datetimes
         result = df[
             (df[timestamp_col_name] >= period_start) & (df[timestamp_col_name] < period_end)
@@ -40,33 +54,33 @@ def filter_to_period(
         N_TS_FORMAT_SAMPLES = 5
         # TODO: Ignore null values
         ts_tests = df[timestamp_col_name].iloc[:N_TS_FORMAT_SAMPLES]
-        ts_tests_lens = tuple(len(txt) for txt in ts_tests)
-        if len(set(ts_tests_lens)) != 1:
+        ts_tests_lens = np.fromiter(
+            (len(txt) for txt in ts_tests), dtype=np.int32, count=len(ts_tests)
+        )
+        if ts_tests_lens.min() != ts_tests_lens.max():
             raise ValueError(
                 "Sampled '%s' values from dataframe have inconsistent length: Cannot infer "
                 "date/time format (min %s to max %s)"
                 % (
                     timestamp_col_name,
-                    min(ts_tests_lens),
-                    max(ts_tests_lens),
+                    ts_tests_lens.min(),
+                    ts_tests_lens.max(),
                 )
             )
-        if all(map(lambda txt: re.match("\d{4}-\d{2}-\d{2}T", txt), ts_tests)):
+        if all(_ISO_T_RE.match(txt) for txt in ts_tests):
             # ISO format e.g. 2000-01-01T12:00:00 (maybe with timezone)
             result = df[
                 (df[timestamp_col_name] >= period_start.isoformat())
                 & (df[timestamp_col_name] < period_end.isoformat())
             ]
-        elif all(map(lambda txt: re.match("\d{4}-\d{2}-\d{2} ", txt), ts_tests)):
+        elif all(_ISO_SPACE_RE.match(txt) for txt in ts_tests):
             # ISO-like format with space instead of T e.g. 2000-01-01 12:00:00
             # ISO format e.g. 2000-01-01T12:00:00 (maybe with timezone)
             result = df[
                 (df[timestamp_col_name] >= period_start.isoformat().replace("T", " "))
                 & (df[timestamp_col_name] < period_end.isoformat().replace("T", " "))
             ]
-        elif (ts_tests_lens[0] < 11) and all(
-            map(lambda txt: re.match("\d{4}(-\d{2}){0,2}", txt), ts_tests)
-        ):
+        elif (ts_tests_lens[0] < 11) and all(_ISO_TRUNC_RE.match(txt) for txt in ts_tests):
             # Truncated ISO-like date e.g. just YYYY-MM or even YYYY.
             start_trunc = period_start.isoformat()[: ts_tests_lens[0]]
             end_trunc = period_end.isoformat()[: ts_tests_lens[0]]
@@ -90,4 +104,6 @@ def filter_to_period(
             % (period_start, timestamp_col_name, period_end)
         )
     print(f"Time period filter kept {n_result} out of {n_raw} records")
-    return result.copy()
+    # A shallow copy detaches the result from `df` (so callers can add/rename columns without
+    # SettingWithCopy issues), without duplicating all the underlying data:
+    return result.copy(deep=False)
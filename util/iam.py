@@ -6,15 +6,22 @@ These will only work if the SageMaker notebook role itself has sufficient IAM pe
 """
 # Python Built-Ins:
 import json
-from time import sleep
+from typing import Dict
 
 # External Dependencies:
 import boto3
 
 
+# Role ARNs already fetched/created in this process, by role name:
+_role_arn_cache: Dict[str, str] = {}
+
+
 def ensure_default_forecast_role(role_name: str = "ForecastRolePOC") -> str:
     """Fetch ARN of a Forecast role allowing full Amazon S3 Access, creating one if needed
 
+    The role ARN is cached for the rest of the Python session, so repeat calls for the same
+    `role_name` don't call IAM again.
+
     If the role already exists, its permissions are not checked or updated. If a new role is
     created, the 'AmazonS3FullAccess' policy is attached which grants full read and write access to
     all buckets in the AWS Account. WARNING: This is a broad permission set that should not
@@ -30,14 +37,18 @@ def ensure_default_forecast_role(role_name: str = "ForecastRolePOC") -> str:
     role_arn :
         ARN of the role.
     """
+    if role_name in _role_arn_cache:
+        return _role_arn_cache[role_name]
+
     iam = boto3.client("iam")
 
     # Try to check if the role exists:
     try:
         role_desc = iam.get_role(RoleName=role_name)
         print(f"Forecast Role '{role_name}' already exists (permissions not checked)")
-        return role_desc["Role"]["Arn"]
-    except Exception:
+        _role_arn_cache[role_name] = role_desc["Role"]["Arn"]
+        return _role_arn_cache[role_name]
+    except iam.exceptions.NoSuchEntityException:
         print(f"Creating new role '{role_name}'...")
 
     # Trust policy should allow Forecast service to assume the role:
@@ -70,6 +81,12 @@ def ensure_default_forecast_role(role_name: str = "ForecastRolePOC") -> str:
         PolicyArn="arn:aws:iam::aws:policy/AmazonS3FullAccess",
     )
     print("Waiting for propagation...")
-    sleep(15)  # Help ensure any functions called immediately after this have the correct perms
+    iam.get_waiter("role_exists").wait(
+        RoleName=role_name,
+        WaiterConfig={"Delay": 1, "MaxAttempts": 30},
+    )
+    # (Forecast may still take a few more seconds to be able to assume the role: See the retries in
+    # amzforecast.create_dataset_import_job_by_hash)
     print("New role ready")
+    _role_arn_cache[role_name] = role_arn
     return role_arn
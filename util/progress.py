@@ -2,9 +2,9 @@
 # SPDX-License-Identifier: MIT-0
 """Utilities for checking and logging progress of long-running operations"""
 # Python Built-Ins:
-from datetime import datetime
+import sys
 import time
-from typing import Callable, Optional, TypeVar, Union
+from typing import Any, Callable, Optional, TypeVar, Union
 
 # External Dependencies:
 from dateutil.relativedelta import relativedelta  # For nice display purposes
@@ -13,6 +13,47 @@ from dateutil.relativedelta import relativedelta  # For nice display purposes
 TStatus = TypeVar("TStatus")
 
 
+def _rd_to_seconds(rd: relativedelta) -> float:
+    """Approximate total duration of a (relative) relativedelta in seconds
+
+    Months and years have no fixed length, so are approximated by their average lengths.
+    """
+    return (
+        ((rd.years * 365.2425 + rd.months * 30.436875 + rd.days) * 24 + rd.hours) * 3600
+        + rd.minutes * 60
+        + rd.seconds
+        + rd.microseconds / 1e6
+    )
+
+
+def _format_eta(eta_raw: Optional[Union[str, relativedelta]]) -> str:
+    """Format an ETA for the spinner message (empty if None, whole minutes for relativedeltas)"""
+    if eta_raw is None:
+        return ""
+    if isinstance(eta_raw, relativedelta):
+        eta_secs = _rd_to_seconds(eta_raw)
+        eta_raw = f"{int(eta_secs // 60)} mins" if eta_secs >= 60 else f"{int(eta_secs)} secs"
+    return f" [ETA: {eta_raw}]"
+
+
+def _is_same_status(a: Any, b: Any) -> bool:
+    """Check whether two polled status objects are equal, ignoring boto3 ResponseMetadata
+
+    Lists/tuples (e.g. of multiple Describe* responses) are compared element-wise. Objects that
+    can't be compared for equality are treated as different.
+    """
+    if isinstance(a, dict) and isinstance(b, dict):
+        if a.keys() != b.keys():
+            return False
+        return all(k == "ResponseMetadata" or _is_same_status(v, b[k]) for k, v in a.items())
+    elif isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_is_same_status(x, y) for x, y in zip(a, b))
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
 def polling_spinner(
     fn_poll_result: Callable[[], TStatus],
     fn_is_finished: Callable[[TStatus], bool],
@@ -21,6 +62,8 @@ def polling_spinner(
     spinner_secs: float = 0.5,
     poll_secs: float = 30,
     timeout_secs: Optional[float] = None,
+    poll_secs_min: float = 5,
+    poll_secs_max: Optional[float] = None,
 ) -> TStatus:
     """Polling wait with loading spinner and elapsed time indicator (plus optional ETA).
 
@@ -46,14 +89,23 @@ def polling_spinner(
         Optional status object stringifier for the console output [defaults to str(status)]
     fn_eta :
         Optional function to extract an estimated time remaining from the result object, returning
-        either a `dateutil.relativedelta` object or a plain string
+        either a `dateutil.relativedelta` object (displayed in minutes, and used to adapt the poll
+        interval) or a plain string (displayed as-is)
     spinner_secs :
         Time to sleep between check cycles. Choosing a divisor of 1s (or rather, `poll_secs`)
         produces nicer-looking updates.
     poll_secs :
         Minimum elapsed time since last poll after which next check cycle will call fn_poll_result
+        (when no numeric ETA is available)
     timeout_secs : Optional
         Optional number of seconds after which to exit the wait raising TimeoutError [default inf]
+    poll_secs_min :
+        Lower bound on the poll interval when it's being adapted to the ETA
+    poll_secs_max : Optional
+        Upper bound on the poll interval when it's being adapted to the ETA [default `poll_secs`].
+        Whenever `fn_eta` returns a `relativedelta`, the poll interval is set to 1/20th of the
+        remaining time, clipped to [`poll_secs_min`, `poll_secs_max`]. Plain string ETAs are
+        only displayed, and leave the interval at `poll_secs`.
 
     Returns
     -------
@@ -61,58 +113,72 @@ def polling_spinner(
         The final result of `fn_poll_result()`
     """
     SPINNER_STATES = ("/", "-", "\\", "|")
+    if poll_secs_max is None:
+        poll_secs_max = poll_secs
+
+    def get_poll_interval(eta_raw: Optional[Union[str, relativedelta]]) -> float:
+        if isinstance(eta_raw, relativedelta):
+            return min(poll_secs_max, max(poll_secs_min, _rd_to_seconds(eta_raw) / 20))
+        return poll_secs
+
     status = fn_poll_result()
-    overall_t0 = datetime.now().replace(microsecond=0)
+    # Monotonic clock for all interval maths (immune to wall-clock adjustments, no allocation):
+    overall_t0 = time.monotonic()
     status_t0 = overall_t0
     poll_t0 = overall_t0
     status_str = fn_stringify_result(status) if fn_stringify_result else str(status)
     if fn_eta:
         eta_raw = fn_eta(status)
-        if eta_raw is None:
-            eta_str = ""
-        else:
-            eta_str = f" [ETA: {eta_raw}]"
     else:
-        eta_str = ""
+        eta_raw = None
+    eta_str = _format_eta(eta_raw)
+    current_poll_secs = get_poll_interval(eta_raw)
     i = 0
+    # On terminals, clear any leftover characters with an ANSI clear-to-EOL code. Otherwise (e.g.
+    # some notebook front-ends) fall back to padding every line to the longest message seen:
+    use_ansi_clear = sys.stdout.isatty()
     maxlen = 0
+    status_changed = False
     print(f"Initial status: {status_str}")
     while not fn_is_finished(status):
-        t = datetime.now()
-        if timeout_secs is not None and (t - overall_t0).total_seconds() >= timeout_secs:
+        t = time.monotonic()
+        if timeout_secs is not None and (t - overall_t0) >= timeout_secs:
             raise TimeoutError(
                 "Maximum wait time exceeded: timeout_secs={}, {}".format(
                     timeout_secs, relativedelta(seconds=timeout_secs)
                 )
             )
-        elif (t - poll_t0).total_seconds() >= poll_secs:
+        elif (t - poll_t0) >= current_poll_secs:
             newstatus = fn_poll_result()
             poll_t0 = t
-            newstatus_str = (
-                fn_stringify_result(newstatus) if fn_stringify_result else str(newstatus)
-            )
-            if status_str == newstatus_str:
-                print("\r", end="")
-            else:
-                print("\n", end="")
-                status_t0 = t
+            # Only re-stringify (and re-extract ETA) when the raw status actually changed:
+            status_unchanged = _is_same_status(newstatus, status)
             status = newstatus
-            status_str = newstatus_str
-            if fn_eta:
-                eta_raw = fn_eta(status)
-                if eta_raw is None:
-                    eta_str = ""
-                else:
-                    eta_str = f" [ETA: {eta_raw}]"
-        else:
-            print("\r", end="")
+            if not status_unchanged:
+                newstatus_str = (
+                    fn_stringify_result(newstatus) if fn_stringify_result else str(newstatus)
+                )
+                if status_str != newstatus_str:
+                    status_changed = True
+                    status_t0 = t
+                status_str = newstatus_str
+                if fn_eta:
+                    eta_raw = fn_eta(status)
+                    eta_str = _format_eta(eta_raw)
+                    current_poll_secs = get_poll_interval(eta_raw)
         i = (i + 1) % len(SPINNER_STATES)
-        msgdelta = relativedelta(t, status_t0)
-        msgdelta.microseconds = 0  # No need to print out such high resolution
+        # Whole seconds only - no need to print out higher resolution:
+        msgdelta = relativedelta(seconds=int(t - status_t0)).normalized()
         msg = f"{SPINNER_STATES[i]} Status: {status_str}{eta_str} [Since: {msgdelta}]"
-        maxlen = max(maxlen, len(msg))
-        msg = msg.ljust(maxlen)
-        print(msg, end="")
+        if use_ansi_clear:
+            msg += "\x1b[K"
+        else:
+            maxlen = max(maxlen, len(msg))
+            msg = msg.ljust(maxlen)
+        # Single write+flush per tick: start a new line if the status changed, else overwrite
+        sys.stdout.write(("\n" if status_changed else "\r") + msg)
+        sys.stdout.flush()
+        status_changed = False
         time.sleep(spinner_secs)
     print("")
     return status